@@ -3,7 +3,7 @@
         materialized='incremental',
         unique_key='transaction_key',
         schema='gold',
-        cluster_by=['transaction_date'],
+        cluster_by=['transaction_date', 'customer_key'],
         tags=['gold', 'fact', 'transactions']
     )
 }}
@@ -27,7 +27,8 @@ Measures:
 - transaction_amount (additive)
 - transaction_count (COUNT(*))
 
-Clustering: By transaction_date for time-series query performance
+Clustering: By (transaction_date, customer_key) so time-windowed scans
+            (e.g. rolling 90/180-day segment math) prune micro-partitions
 
 Usage:
   -- Star schema query
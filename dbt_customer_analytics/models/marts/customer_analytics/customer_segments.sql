@@ -1,7 +1,10 @@
 {{
     config(
-        materialized='table',
+        materialized='incremental',
+        unique_key='customer_key',
         schema='gold',
+        cluster_by=['customer_segment', 'customer_key'],
+        query_tag='customer_segments_perf_test',
         tags=['gold', 'mart', 'segmentation']
     )
 }}
@@ -27,6 +30,11 @@ Rolling Window:
 - Prior 90 days: Previous period (days 91-180) for trend analysis
 - Recalculate monthly to capture behavior changes
 
+Materialization: Incremental on customer_key — each run re-segments
+every customer with activity inside the last build's 180-day horizon,
+since the stored rolling metrics are CURRENT_DATE-relative and shift
+with every run; use --full-refresh to rebuild everyone
+
 Usage:
   -- Segment distribution
   SELECT customer_segment, COUNT(*) AS customer_count
@@ -66,6 +74,22 @@ WITH customer_metrics AS (
         necessities_spend_pct
 
     FROM {{ ref('int_customer_transaction_summary') }}
+
+    {% if is_incremental() %}
+    -- Re-segment every customer whose rolling windows can shift: the
+    -- stored 90/180-day metrics are CURRENT_DATE-relative, so any
+    -- transaction inside the last build's 180-day horizon (newly landed
+    -- or aging out of a window) changes them — a customer who simply
+    -- stops transacting still drifts into Declining. Customers with no
+    -- activity in that horizon carry all-zero windows that stay zero.
+    WHERE customer_key IN (
+        SELECT DISTINCT customer_key
+        FROM {{ ref('fct_transactions') }}
+        WHERE transaction_date >= DATEADD(
+            day, -180, (SELECT MAX(segment_assigned_date) FROM {{ this }})
+        )
+    )
+    {% endif %}
 ),
 
 segment_assignment AS (
@@ -0,0 +1,33 @@
+{{
+    config(
+        materialized='table',
+        schema='gold',
+        tags=['gold', 'mart', 'segmentation']
+    )
+}}
+
+{#
+============================================================================
+Gold Layer: Segment Distribution (pre-aggregated)
+============================================================================
+Purpose: Precompute the GROUP BY customer_segment distribution that the
+         summary/recalculation validation queries run repeatedly, so reads
+         become a 5-row lookup instead of a full segment-table scan
+
+Grain: One row per customer_segment (5 rows)
+
+Usage:
+  SELECT * FROM mv_customer_segment_distribution
+  ORDER BY avg_ltv DESC;
+============================================================================
+#}
+
+SELECT
+    customer_segment,
+    COUNT(*) AS customer_count,
+    AVG(lifetime_value) AS avg_ltv,
+    AVG(avg_monthly_spend) AS avg_monthly_spend,
+    AVG(spend_change_pct) AS avg_change_pct
+
+FROM {{ ref('customer_segments') }}
+GROUP BY customer_segment
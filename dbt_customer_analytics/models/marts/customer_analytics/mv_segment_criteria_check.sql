@@ -0,0 +1,54 @@
+{{
+    config(
+        materialized='table',
+        schema='gold',
+        tags=['gold', 'mart', 'segmentation']
+    )
+}}
+
+{#
+============================================================================
+Gold Layer: Segment Criteria Check (pre-aggregated)
+============================================================================
+Purpose: Pre-aggregate the per-segment criteria counts so validation queries
+         (and the segmentation integration tests) read one row per segment
+         instead of each re-scanning customer_segments
+
+Grain: One row per customer_segment (5 rows)
+
+Usage:
+  SELECT * FROM mv_segment_criteria_check
+  WHERE customer_segment = 'High-Value Travelers';
+============================================================================
+#}
+
+SELECT
+    customer_segment,
+    COUNT(*) AS total_count,
+
+    -- High-Value Travelers criteria
+    COUNT_IF(avg_monthly_spend >= 5000) AS meets_hv_spend,
+    COUNT_IF(travel_spend_pct >= 25) AS meets_hv_travel,
+
+    -- Declining criteria
+    COUNT_IF(spend_change_pct <= -30) AS meets_decline,
+    COUNT_IF(spend_prior_90_days >= 2000) AS meets_prior_spend,
+
+    -- New & Growing criteria
+    COUNT_IF(tenure_months <= 6) AS meets_tenure,
+    COUNT_IF(spend_change_pct >= 50) AS meets_growth,
+
+    -- Budget-Conscious criteria
+    COUNT_IF(avg_monthly_spend < 1500) AS meets_budget_spend,
+    COUNT_IF(necessities_spend_pct >= 60) AS meets_necessity,
+
+    -- Segment averages for reporting
+    AVG(avg_monthly_spend) AS avg_monthly_spend,
+    AVG(travel_spend_pct) AS avg_travel_pct,
+    AVG(spend_change_pct) AS avg_change_pct,
+    AVG(spend_prior_90_days) AS avg_prior_spend,
+    AVG(tenure_months) AS avg_tenure,
+    AVG(necessities_spend_pct) AS avg_necessity_pct
+
+FROM {{ ref('customer_segments') }}
+GROUP BY customer_segment
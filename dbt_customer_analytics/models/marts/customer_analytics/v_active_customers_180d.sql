@@ -0,0 +1,44 @@
+{{
+    config(
+        materialized='view',
+        schema='gold',
+        tags=['gold', 'mart', 'segmentation']
+    )
+}}
+
+{#
+============================================================================
+Gold Layer: Active Customers, Last 180 Days (view)
+============================================================================
+Purpose: Pre-aggregate per-customer 90-day / prior-90-day spend over the
+         last 180 days of fct_transactions, so rolling-window validation
+         joins this view instead of re-aggregating the fact table
+
+Grain: One row per customer_key with >= 1 transaction in the last 180 days
+       (inactive customers are simply absent — COALESCE to 0 on join)
+
+Notes: The date filter aligns with the (transaction_date, customer_key)
+       clustering key on fct_transactions, so only recent micro-partitions
+       are scanned
+
+Usage:
+  SELECT s.customer_key, COALESCE(v.last_90, 0) AS last_90
+  FROM customer_segments s
+  LEFT JOIN v_active_customers_180d v USING (customer_key);
+============================================================================
+#}
+
+SELECT
+    customer_key,
+    SUM(CASE
+        WHEN transaction_date >= DATEADD('day', -90, CURRENT_DATE())
+        THEN transaction_amount
+    END) AS last_90,
+    SUM(CASE
+        WHEN transaction_date < DATEADD('day', -90, CURRENT_DATE())
+        THEN transaction_amount
+    END) AS prior_90
+
+FROM {{ ref('fct_transactions') }}
+WHERE transaction_date >= DATEADD('day', -180, CURRENT_DATE())
+GROUP BY customer_key
@@ -3,6 +3,7 @@
         materialized='incremental',
         unique_key='transaction_id',
         on_schema_change='fail',
+        query_tag='stg_transactions_inc_' ~ invocation_id,
         tags=['staging', 'transactions', 'incremental']
     )
 }}
@@ -0,0 +1,54 @@
+-- ============================================================================
+-- Create Enriched Churn Predictions Table
+-- ============================================================================
+-- Purpose: Denormalize the behavioral fields that analysis queries keep
+--          re-joining onto CHURN_PREDICTIONS so high-risk profiling is a
+--          single-table scan
+--
+-- Output: GOLD.CHURN_PREDICTIONS_ENRICHED table with:
+--   - all CHURN_PREDICTIONS columns
+--   - days_since_last_transaction (from customer_360_profile)
+--   - spend_change_pct (from customer_segments)
+--
+-- Usage:
+--   Run after 05_apply_predictions.sql (and re-run whenever predictions
+--   are refreshed)
+--
+-- Note:
+--   Snowflake materialized views cannot contain joins, so this is a plain
+--   CTAS refreshed alongside the predictions table.
+--
+-- Prerequisites:
+--   - GOLD.CHURN_PREDICTIONS exists (05 script)
+--   - GOLD.CUSTOMER_360_PROFILE and GOLD.CUSTOMER_SEGMENTS populated
+-- ============================================================================
+
+-- Set context
+USE ROLE ACCOUNTADMIN;
+USE WAREHOUSE COMPUTE_WH;
+USE DATABASE CUSTOMER_ANALYTICS;
+USE SCHEMA GOLD;
+
+CREATE OR REPLACE TABLE GOLD.CHURN_PREDICTIONS_ENRICHED AS
+SELECT
+    pred.*,
+    cp.days_since_last_transaction,
+    seg.spend_change_pct
+FROM GOLD.CHURN_PREDICTIONS pred
+JOIN GOLD.CUSTOMER_360_PROFILE cp ON pred.customer_id = cp.customer_id
+JOIN GOLD.CUSTOMER_SEGMENTS seg ON pred.customer_id = seg.customer_id;
+
+-- ============================================================================
+-- Validation Queries
+-- ============================================================================
+
+-- Row count should match CHURN_PREDICTIONS (inner joins on scored customers)
+SELECT COUNT(*) AS enriched_predictions FROM GOLD.CHURN_PREDICTIONS_ENRICHED;
+
+-- High-risk profile now needs no joins
+SELECT
+    COUNT(*) AS high_risk_count,
+    AVG(spend_change_pct) AS avg_spend_change,
+    AVG(days_since_last_transaction) AS avg_days_since_transaction
+FROM GOLD.CHURN_PREDICTIONS_ENRICHED
+WHERE churn_risk_score >= 70;
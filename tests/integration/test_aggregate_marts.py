@@ -17,6 +17,14 @@ import time
 from pathlib import Path
 from tests.conftest import snowflake_connection, dbt_project_dir
 
+# The mart builds and metric-validation queries scan GOLD tables, so
+# the module needs a running warehouse. The dbt_build xdist group serializes
+# all dbt-invoking modules onto one worker: concurrent dbt runs against
+# the shared project dir would race on target/ artifacts and on
+# dbt deps writes to dbt_packages/.
+pytestmark = [pytest.mark.xdist_group(name="dbt_build"),
+              pytest.mark.warehouse]
+
 
 @pytest.fixture(scope="module")
 def aggregate_marts_setup(snowflake_connection, dbt_project_dir):
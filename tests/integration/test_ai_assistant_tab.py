@@ -23,6 +23,11 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../streamlit'))
 
 from tabs.ai_assistant import SUGGESTED_QUESTIONS, call_cortex_analyst_mock
 
+# The mock-analyst answers are validated by running their SQL against
+# GOLD tables; the offline formatting tests ride along in the warehouse
+# group since they are not metadata probes
+pytestmark = pytest.mark.warehouse
+
 # Load environment variables
 load_dotenv()
 
@@ -38,6 +43,10 @@ def snowflake_conn():
         database=os.getenv("SNOWFLAKE_DATABASE", "CUSTOMER_ANALYTICS"),
         schema=os.getenv("SNOWFLAKE_SCHEMA", "GOLD"),
         role=os.getenv("SNOWFLAKE_ROLE", "SYSADMIN"),
+        session_parameters={
+            "CLIENT_METADATA_REQUEST_USE_CONNECTION_CTX": True,
+            "USE_CACHED_RESULT": True,
+        },
     )
     yield conn
     conn.close()
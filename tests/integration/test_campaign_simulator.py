@@ -24,6 +24,11 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../streamlit'))
 
 from tabs.campaign_simulator import calculate_campaign_roi
 
+# Audience selection and ROI queries aggregate CUSTOMER_360_PROFILE;
+# the pure-Python ROI logic test rides along in the warehouse group
+# since it is not a metadata probe
+pytestmark = pytest.mark.warehouse
+
 # Load environment variables
 load_dotenv()
 
@@ -39,6 +44,10 @@ def snowflake_conn():
         database=os.getenv("SNOWFLAKE_DATABASE", "CUSTOMER_ANALYTICS"),
         schema=os.getenv("SNOWFLAKE_SCHEMA", "GOLD"),
         role=os.getenv("SNOWFLAKE_ROLE", "SYSADMIN"),
+        session_parameters={
+            "CLIENT_METADATA_REQUEST_USE_CONNECTION_CTX": True,
+            "USE_CACHED_RESULT": True,
+        },
     )
     yield conn
     conn.close()
@@ -24,6 +24,11 @@ from dotenv import load_dotenv
 # Load environment variables
 load_dotenv()
 
+# Share a worker with test_churn_training_data.py under pytest-xdist so the
+# churn setup runs once, while other integration files parallelize freely
+pytestmark = [pytest.mark.xdist_group(name="snowflake_ro"),
+              pytest.mark.warehouse]
+
 
 @pytest.fixture(scope="module")
 def snowflake_conn():
@@ -36,6 +41,10 @@ def snowflake_conn():
         database=os.getenv("SNOWFLAKE_DATABASE", "CUSTOMER_ANALYTICS"),
         schema=os.getenv("SNOWFLAKE_SCHEMA", "GOLD"),
         role=os.getenv("SNOWFLAKE_ROLE", "SYSADMIN"),
+        session_parameters={
+            "CLIENT_METADATA_REQUEST_USE_CONNECTION_CTX": True,
+            "USE_CACHED_RESULT": True,
+        },
     )
     yield conn
     conn.close()
@@ -241,39 +250,48 @@ def test_churn_risk_score_distribution(cursor):
 # ============================================================================
 
 
-def test_high_risk_customers_make_sense(cursor):
+def test_high_risk_customers_make_sense(snowflake_conn, cursor):
     """
     Test that high-risk customers have expected characteristics.
 
     Validates:
     - Most have negative spend_change_pct (declining spend)
     - Most have high days_since_last_transaction (inactive)
+
+    The existence check and the aggregation are independent, so both are
+    submitted asynchronously and the round-trips overlap.
     """
-    cursor.execute("""
+    cursor.execute_async("""
         SELECT COUNT(*) AS table_exists
         FROM INFORMATION_SCHEMA.TABLES
         WHERE TABLE_SCHEMA = 'GOLD'
-          AND TABLE_NAME = 'CHURN_PREDICTIONS'
+          AND TABLE_NAME = 'CHURN_PREDICTIONS_ENRICHED'
     """)
-    result = cursor.fetchone()
-
-    if result[0] == 0:
-        pytest.skip("CHURN_PREDICTIONS table does not exist")
+    exists_qid = cursor.sfqid
 
-    # Analyze high-risk customer characteristics
-    cursor.execute("""
+    # Analyze high-risk customer characteristics - single-table scan against
+    # the denormalized predictions table (06_create_predictions_enriched.sql)
+    agg_cursor = snowflake_conn.cursor()
+    agg_cursor.execute_async("""
         SELECT
             COUNT(*) AS high_risk_count,
-            AVG(seg.spend_change_pct) AS avg_spend_change,
-            AVG(cp.days_since_last_transaction) AS avg_days_since_transaction,
-            SUM(CASE WHEN seg.spend_change_pct < 0 THEN 1 ELSE 0 END) AS declining_count,
-            SUM(CASE WHEN cp.days_since_last_transaction > 30 THEN 1 ELSE 0 END) AS inactive_count
-        FROM GOLD.CHURN_PREDICTIONS pred
-        JOIN GOLD.CUSTOMER_360_PROFILE cp ON pred.customer_id = cp.customer_id
-        JOIN GOLD.CUSTOMER_SEGMENTS seg ON pred.customer_id = seg.customer_id
-        WHERE pred.churn_risk_score >= 70
+            AVG(spend_change_pct) AS avg_spend_change,
+            AVG(days_since_last_transaction) AS avg_days_since_transaction,
+            SUM(CASE WHEN spend_change_pct < 0 THEN 1 ELSE 0 END) AS declining_count,
+            SUM(CASE WHEN days_since_last_transaction > 30 THEN 1 ELSE 0 END) AS inactive_count
+        FROM GOLD.CHURN_PREDICTIONS_ENRICHED
+        WHERE churn_risk_score >= 70
     """)
-    stats = cursor.fetchone()
+    agg_qid = agg_cursor.sfqid
+
+    cursor.get_results_from_sfqid(exists_qid)
+    result = cursor.fetchone()
+
+    if result[0] == 0:
+        pytest.skip("CHURN_PREDICTIONS_ENRICHED table does not exist - run 06_create_predictions_enriched.sql first")
+
+    agg_cursor.get_results_from_sfqid(agg_qid)
+    stats = agg_cursor.fetchone()
 
     if stats[0] == 0:
         pytest.skip("No high-risk customers found (score >= 70)")
@@ -333,11 +351,13 @@ def test_customer_360_updated_with_predictions(cursor):
     if scored > 0:
         assert categorized >= scored * 0.99, "Some scored customers missing churn_risk_category"
 
-    # Check category distribution
+    # Check category distribution (percentages computed server-side to avoid
+    # recomputing against `scored` in Python)
     cursor.execute("""
         SELECT
             churn_risk_category,
-            COUNT(*) AS customer_count
+            COUNT(*) AS customer_count,
+            ROUND(COUNT(*) * 100.0 / SUM(COUNT(*)) OVER (), 1) AS pct_of_scored
         FROM GOLD.CUSTOMER_360_PROFILE
         WHERE churn_risk_category IS NOT NULL
         GROUP BY churn_risk_category
@@ -346,9 +366,8 @@ def test_customer_360_updated_with_predictions(cursor):
     categories = cursor.fetchall()
 
     print(f"\nCustomer 360 Churn Categories:")
-    for category, count in categories:
-        pct = (count / scored) * 100
-        print(f"  {category}: {count} ({pct:.1f}%)")
+    for category, count, pct in categories:
+        print(f"  {category}: {count} ({pct}%)")
 
     print(f"\nRetention Campaign Eligible: {retention_eligible} customers")
 
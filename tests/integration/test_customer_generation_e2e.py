@@ -6,65 +6,82 @@ Tests the complete workflow from CLI invocation to CSV file creation.
 
 import pytest
 import pandas as pd
+import pyarrow.csv as pacsv
 import tempfile
 import os
 from pathlib import Path
 from click.testing import CliRunner
 
 from data_generation.cli import cli
-from data_generation.customer_generator import validate_customer_data
+from data_generation.customer_generator import generate_customers, validate_customer_data
+
+
+def read_generated_csv(path):
+    """Read a generated CSV via pyarrow's multithreaded reader."""
+    # Treat empty strings as null so optional columns (e.g. decline_type)
+    # round-trip the same way pd.read_csv parses them
+    return pacsv.read_csv(
+        str(path),
+        convert_options=pacsv.ConvertOptions(strings_can_be_null=True),
+    ).to_pandas()
 
 
 class TestCustomerGenerationE2E:
     """End-to-end tests for customer generation workflow."""
 
-    def test_cli_generates_valid_file(self):
-        """Test complete workflow: CLI -> generate -> validate -> save."""
+    @pytest.fixture(scope="class")
+    def generated_1000(self, tmp_path_factory):
+        """
+        Generate the standard 1000-customer CSV once per class.
+
+        The tests that only inspect the standard output share this result
+        instead of each re-invoking the CLI.
+        """
+        output_file = tmp_path_factory.mktemp("customers") / "test_customers.csv"
         runner = CliRunner()
 
-        with tempfile.TemporaryDirectory() as tmpdir:
-            output_file = Path(tmpdir) / "test_customers.csv"
+        result = runner.invoke(
+            cli,
+            [
+                "generate-customers",
+                "--count", "1000",
+                "--output", str(output_file),
+                "--seed", "42",
+            ]
+        )
 
-            # Run CLI command
-            result = runner.invoke(
-                cli,
-                [
-                    "generate-customers",
-                    "--count", "1000",
-                    "--output", str(output_file),
-                    "--seed", "42",
-                ]
-            )
+        assert result.exit_code == 0, \
+            f"CLI command failed with output:\n{result.output}"
 
-            # Check command succeeded
-            assert result.exit_code == 0, \
-                f"CLI command failed with output:\n{result.output}"
+        df = read_generated_csv(output_file)
 
-            # Check file was created
-            assert output_file.exists(), "Output file was not created"
+        # Validate once here so dependent tests don't re-run the O(N) pass
+        validation = validate_customer_data(df)
+        return result, df, output_file, validation
 
-            # Load CSV
-            df = pd.read_csv(output_file)
+    def test_cli_generates_valid_file(self, generated_1000):
+        """Test complete workflow: CLI -> generate -> validate -> save."""
+        result, df, output_file, validation = generated_1000
 
-            # Verify row count
-            assert len(df) == 1000, f"Expected 1000 rows, got {len(df)}"
+        # Check file was created
+        assert output_file.exists(), "Output file was not created"
 
-            # Run validation
-            validation = validate_customer_data(df)
+        # Verify row count
+        assert len(df) == 1000, f"Expected 1000 rows, got {len(df)}"
 
-            # Check validation passes
-            assert validation["is_valid"] is True, \
-                f"Validation failed with errors: {validation['errors']}"
+        # Check validation passes
+        assert validation["is_valid"] is True, \
+            f"Validation failed with errors: {validation['errors']}"
 
-            # Verify expected columns exist
-            expected_columns = [
-                "customer_id", "first_name", "last_name", "email", "age",
-                "state", "city", "employment_status", "card_type",
-                "credit_limit", "account_open_date", "customer_segment", "decline_type"
-            ]
+        # Verify expected columns exist
+        expected_columns = [
+            "customer_id", "first_name", "last_name", "email", "age",
+            "state", "city", "employment_status", "card_type",
+            "credit_limit", "account_open_date", "customer_segment", "decline_type"
+        ]
 
-            for col in expected_columns:
-                assert col in df.columns, f"Missing column: {col}"
+        for col in expected_columns:
+            assert col in df.columns, f"Missing column: {col}"
 
     def test_cli_with_custom_output_path(self):
         """Test CLI with nested output directory path."""
@@ -87,38 +104,20 @@ class TestCustomerGenerationE2E:
             assert result.exit_code == 0, f"CLI failed: {result.output}"
             assert output_file.exists(), "File not created in nested directory"
 
-            df = pd.read_csv(output_file)
+            df = read_generated_csv(output_file)
             assert len(df) == 500
 
     def test_cli_different_seeds_produce_different_data(self):
         """Test that different seeds produce different customer data."""
-        runner = CliRunner()
+        # The determinism contract lives in the generator function, so call
+        # it in-process instead of paying the CLI/CSV round-trip twice
+        df1 = generate_customers(100, seed=42)
+        df2 = generate_customers(100, seed=123)
 
-        with tempfile.TemporaryDirectory() as tmpdir:
-            file1 = Path(tmpdir) / "customers_seed1.csv"
-            file2 = Path(tmpdir) / "customers_seed2.csv"
-
-            # Generate with seed 42
-            result1 = runner.invoke(
-                cli,
-                ["generate-customers", "--count", "100", "--output", str(file1), "--seed", "42"]
-            )
-            assert result1.exit_code == 0
-
-            # Generate with seed 123
-            result2 = runner.invoke(
-                cli,
-                ["generate-customers", "--count", "100", "--output", str(file2), "--seed", "123"]
-            )
-            assert result2.exit_code == 0
-
-            df1 = pd.read_csv(file1)
-            df2 = pd.read_csv(file2)
-
-            # DataFrames should have different data (not identical)
-            # Check that at least some emails differ (high probability with different seeds)
-            assert not df1["email"].equals(df2["email"]), \
-                "Different seeds should produce different data"
+        # DataFrames should have different data (not identical)
+        # Check that at least some emails differ (high probability with different seeds)
+        assert not df1["email"].equals(df2["email"]), \
+            "Different seeds should produce different data"
 
     def test_cli_same_seed_produces_identical_data(self):
         """Test that same seed produces identical customer data."""
@@ -128,7 +127,8 @@ class TestCustomerGenerationE2E:
             file1 = Path(tmpdir) / "customers_run1.csv"
             file2 = Path(tmpdir) / "customers_run2.csv"
 
-            # Generate twice with same seed
+            # Generate twice with same seed - keep the CLI path here since the
+            # test asserts the full pipeline writes identical bytes
             for filepath in [file1, file2]:
                 result = runner.invoke(
                     cli,
@@ -136,11 +136,14 @@ class TestCustomerGenerationE2E:
                 )
                 assert result.exit_code == 0
 
-            df1 = pd.read_csv(file1)
-            df2 = pd.read_csv(file2)
+            # Determinism means the CSV bytes themselves must match, so a
+            # hash comparison replaces parsing both files
+            import hashlib
 
-            # DataFrames should be identical
-            pd.testing.assert_frame_equal(df1, df2)
+            hash1 = hashlib.blake2b(file1.read_bytes()).digest()
+            hash2 = hashlib.blake2b(file2.read_bytes()).digest()
+
+            assert hash1 == hash2, "Same seed should produce identical data"
 
     def test_cli_large_customer_count(self):
         """Test CLI can generate large number of customers (10K)."""
@@ -157,58 +160,38 @@ class TestCustomerGenerationE2E:
             assert result.exit_code == 0, f"Large generation failed: {result.output}"
             assert output_file.exists()
 
-            df = pd.read_csv(output_file)
+            df = read_generated_csv(output_file)
             assert len(df) == 10000
 
             # Quick validation
             validation = validate_customer_data(df)
             assert validation["is_valid"] is True
 
-    def test_cli_output_includes_statistics(self):
+    def test_cli_output_includes_statistics(self, generated_1000):
         """Test CLI output includes validation statistics."""
-        runner = CliRunner()
-
-        with tempfile.TemporaryDirectory() as tmpdir:
-            output_file = Path(tmpdir) / "customers.csv"
-
-            result = runner.invoke(
-                cli,
-                ["generate-customers", "--count", "1000", "--output", str(output_file)]
-            )
+        result, _, _, _ = generated_1000
 
-            # Check output contains expected statistics
-            assert "Statistics:" in result.output
-            assert "Segment Distribution:" in result.output
-            assert "Card Type Distribution:" in result.output
-            assert "Validation passed" in result.output
-            assert "Successfully saved" in result.output
+        # Check output contains expected statistics
+        assert "Statistics:" in result.output
+        assert "Segment Distribution:" in result.output
+        assert "Card Type Distribution:" in result.output
+        assert "Validation passed" in result.output
+        assert "Successfully saved" in result.output
 
-    def test_csv_file_has_correct_structure(self):
+    def test_csv_file_has_correct_structure(self, generated_1000):
         """Test generated CSV has correct column order and data types."""
-        runner = CliRunner()
-
-        with tempfile.TemporaryDirectory() as tmpdir:
-            output_file = Path(tmpdir) / "customers.csv"
-
-            result = runner.invoke(
-                cli,
-                ["generate-customers", "--count", "100", "--output", str(output_file)]
-            )
-
-            assert result.exit_code == 0
-
-            df = pd.read_csv(output_file)
-
-            # Check column order (first few columns)
-            assert df.columns[0] == "customer_id"
-            assert df.columns[1] == "first_name"
-            assert df.columns[2] == "last_name"
-            assert df.columns[3] == "email"
-
-            # Check data types can be inferred correctly
-            assert df["customer_id"].dtype == object
-            assert df["age"].dtype in [int, 'int64']
-            assert df["credit_limit"].dtype in [int, 'int64']
+        _, df, _, _ = generated_1000
+
+        # Check column order (first few columns)
+        assert df.columns[0] == "customer_id"
+        assert df.columns[1] == "first_name"
+        assert df.columns[2] == "last_name"
+        assert df.columns[3] == "email"
+
+        # Check data types can be inferred correctly
+        assert pd.api.types.is_string_dtype(df["customer_id"])
+        assert pd.api.types.is_integer_dtype(df["age"])
+        assert pd.api.types.is_integer_dtype(df["credit_limit"])
 
 
 if __name__ == "__main__":
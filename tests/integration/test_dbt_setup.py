@@ -12,11 +12,19 @@ Tests validate:
 - Observability logging functions
 """
 
+import json
 import pytest
-import subprocess
 import os
 from pathlib import Path
 
+# The staging builds and source probes all need a live warehouse
+# session. The dbt_build xdist group serializes
+# all dbt-invoking modules onto one worker: concurrent dbt runs against
+# the shared project dir would race on target/ artifacts and on
+# dbt deps writes to dbt_packages/.
+pytestmark = [pytest.mark.xdist_group(name="dbt_build"),
+              pytest.mark.warehouse]
+
 
 # ============================================================================
 # Fixtures
@@ -57,11 +65,59 @@ def dbt_env() -> dict:
     return env
 
 
+@pytest.fixture(scope="module")
+def dbt_manifest(dbt_project_dir: Path, dbt_runner):
+    """
+    Parse the dbt project once and return the in-memory Manifest.
+
+    dbt parse skips SQL rendering (roughly 2x faster than compile), and the
+    resulting manifest answers structural ref/source questions offline —
+    no Snowflake round-trip and no re-parse per test.
+    """
+    res = dbt_runner.invoke([
+        "parse",
+        "--project-dir", str(dbt_project_dir),
+        "--profiles-dir", str(dbt_project_dir),
+    ])
+
+    assert res.success, f"dbt parse failed:\n{res.exception}"
+    return res.result
+
+
+@pytest.fixture(scope="module")
+def dbt_staging_build(dbt_project_dir: Path, dbt_env: dict, dbt_runner):
+    """
+    Run dbt deps plus one dbt build over the staging models, once per module.
+
+    dbt build runs and tests the models in a single invocation, so the
+    compile/deps/run/test assertions below read the shared result and the
+    target/ artifacts instead of each spawning their own dbt call.
+
+    Returns (build_result, manifest, run_results) where the last two are the
+    parsed target/manifest.json and target/run_results.json.
+    """
+    project_args = [
+        "--project-dir", str(dbt_project_dir),
+        "--profiles-dir", str(dbt_project_dir),
+    ]
+
+    deps_res = dbt_runner.invoke(["deps"] + project_args)
+    assert deps_res.success, f"dbt deps failed:\n{deps_res.exception}"
+
+    build_res = dbt_runner.invoke(["build", "--select", "staging"] + project_args)
+
+    target_dir = dbt_project_dir / "target"
+    manifest = json.loads((target_dir / "manifest.json").read_text())
+    run_results = json.loads((target_dir / "run_results.json").read_text())
+
+    return build_res, manifest, run_results
+
+
 # ============================================================================
 # Test 1: dbt Project Compiles
 # ============================================================================
 
-def test_dbt_project_compiles(dbt_project_dir: Path, dbt_env: dict):
+def test_dbt_project_compiles(dbt_staging_build):
     """
     Verify dbt project compiles without errors.
 
@@ -70,16 +126,12 @@ def test_dbt_project_compiles(dbt_project_dir: Path, dbt_env: dict):
     - All models have valid SQL syntax
     - No Jinja templating errors
     """
-    result = subprocess.run(
-        ["dbt", "compile"],
-        cwd=dbt_project_dir,
-        env=dbt_env,
-        capture_output=True,
-        text=True
-    )
+    build_res, manifest, _ = dbt_staging_build
 
-    assert result.returncode == 0, \
-        f"dbt compile failed:\n{result.stdout}\n{result.stderr}"
+    # The shared build parsed and compiled the project; a populated manifest
+    # means dbt_project.yml and the model Jinja/SQL all rendered
+    assert build_res.success, f"dbt build failed:\n{build_res.exception}"
+    assert manifest.get("nodes"), "manifest.json has no nodes - project did not compile"
 
     print(f"\n✓ dbt project compiled successfully")
 
@@ -88,25 +140,15 @@ def test_dbt_project_compiles(dbt_project_dir: Path, dbt_env: dict):
 # Test 2: dbt Dependencies Install
 # ============================================================================
 
-def test_dbt_dependencies_install(dbt_project_dir: Path, dbt_env: dict):
+def test_dbt_dependencies_install(dbt_project_dir: Path, dbt_staging_build):
     """
     Verify dbt dependencies (packages) install successfully.
 
     Expected packages:
     - dbt_utils
     """
-    result = subprocess.run(
-        ["dbt", "deps"],
-        cwd=dbt_project_dir,
-        env=dbt_env,
-        capture_output=True,
-        text=True
-    )
-
-    assert result.returncode == 0, \
-        f"dbt deps failed:\n{result.stdout}\n{result.stderr}"
-
-    # Verify dbt_utils package installed
+    # dbt deps already ran inside the shared build fixture; verify
+    # dbt_utils package installed
     dbt_packages_dir = dbt_project_dir / "dbt_packages"
     assert dbt_packages_dir.exists(), "dbt_packages directory not created"
 
@@ -121,7 +163,7 @@ def test_dbt_dependencies_install(dbt_project_dir: Path, dbt_env: dict):
 # Test 3: Sources Accessible
 # ============================================================================
 
-def test_sources_accessible(dbt_project_dir: Path, dbt_env: dict):
+def test_sources_accessible(snowflake_connection, dbt_manifest):
     """
     Verify Bronze sources are accessible from dbt.
 
@@ -129,27 +171,42 @@ def test_sources_accessible(dbt_project_dir: Path, dbt_env: dict):
     - bronze_customers source can be queried
     - bronze_transactions source can be queried
     """
-    # Test bronze_customers source
-    result = subprocess.run(
-        ["dbt", "run-operation", "test", "--args", "{'name': 'bronze', 'table': 'bronze_customers'}"],
-        cwd=dbt_project_dir,
-        env=dbt_env,
-        capture_output=True,
-        text=True
-    )
-
-    # Note: run-operation might not work for source testing
-    # Alternative: Try to compile a model that references the source
-    result = subprocess.run(
-        ["dbt", "compile", "--select", "stg_customers"],
-        cwd=dbt_project_dir,
-        env=dbt_env,
-        capture_output=True,
-        text=True
+    # dbt-side wiring: both sources must resolve in the parsed manifest
+    # (offline lookup, no compile needed)
+    source_ids = (
+        "source.customer_analytics.bronze.raw_customers",
+        "source.customer_analytics.bronze.raw_transactions",
     )
-
-    assert result.returncode == 0, \
-        f"Cannot access bronze_customers source:\n{result.stdout}\n{result.stderr}"
+    for source_id in source_ids:
+        assert source_id in dbt_manifest.sources, \
+            f"Source not defined in dbt project: {source_id}"
+
+    # Snowflake side: one metadata query (answered from the cloud services
+    # layer) replaces spawning dbt just to prove the source tables exist.
+    # Schema and identifiers come from the manifest, so the probe checks
+    # the physical tables the sources actually resolve to
+    # (BRONZE.RAW_*) and cannot drift from _staging_sources.yml.
+    expected_tables = {
+        (dbt_manifest.sources[sid].schema.upper(),
+         dbt_manifest.sources[sid].identifier.upper())
+        for sid in source_ids
+    }
+    schemas = sorted({schema for schema, _ in expected_tables})
+    identifiers = sorted({name for _, name in expected_tables})
+
+    cursor = snowflake_connection.cursor()
+    cursor.execute(f"""
+        SELECT TABLE_SCHEMA, TABLE_NAME
+        FROM CUSTOMER_ANALYTICS.INFORMATION_SCHEMA.TABLES
+        WHERE TABLE_SCHEMA IN ({', '.join(['%s'] * len(schemas))})
+          AND TABLE_NAME IN ({', '.join(['%s'] * len(identifiers))})
+    """, (*schemas, *identifiers))
+    existing_tables = set(cursor.fetchall())
+    cursor.close()
+
+    missing_tables = expected_tables - existing_tables
+    assert not missing_tables, \
+        f"Source tables not found in Snowflake: {sorted(missing_tables)}"
 
     print(f"\n✓ Bronze sources accessible")
 
@@ -158,7 +215,7 @@ def test_sources_accessible(dbt_project_dir: Path, dbt_env: dict):
 # Test 4: Staging Models Build
 # ============================================================================
 
-def test_staging_models_build(dbt_project_dir: Path, dbt_env: dict):
+def test_staging_models_build(dbt_staging_build, dbt_manifest):
     """
     Verify staging models build successfully.
 
@@ -166,24 +223,27 @@ def test_staging_models_build(dbt_project_dir: Path, dbt_env: dict):
     - stg_customers
     - stg_transactions
     """
-    result = subprocess.run(
-        ["dbt", "run", "--select", "staging"],
-        cwd=dbt_project_dir,
-        env=dbt_env,
-        capture_output=True,
-        text=True
-    )
+    _, _, run_results = dbt_staging_build
+
+    # Structural check against the parsed manifest (no SQL execution)
+    for node_id in (
+        "model.customer_analytics.stg_customers",
+        "model.customer_analytics.stg_transactions",
+    ):
+        assert node_id in dbt_manifest.nodes, f"Model not found in project: {node_id}"
 
-    assert result.returncode == 0, \
-        f"Staging models failed to build:\n{result.stdout}\n{result.stderr}"
+    # Check model outcomes from the shared build's run_results.json
+    model_status = {
+        r["unique_id"].split(".")[-1]: r["status"]
+        for r in run_results["results"]
+        if r["unique_id"].startswith("model.")
+    }
 
-    # Check that both models were built
-    assert "stg_customers" in result.stdout, "stg_customers model not built"
-    assert "stg_transactions" in result.stdout, "stg_transactions model not built"
+    assert "stg_customers" in model_status, "stg_customers model not built"
+    assert "stg_transactions" in model_status, "stg_transactions model not built"
 
-    # Check for SUCCESS indicators
-    assert "Completed successfully" in result.stdout or "SUCCESS" in result.stdout, \
-        "Models did not complete successfully"
+    failed = [name for name, status in model_status.items() if status != "success"]
+    assert not failed, f"Models did not complete successfully: {failed}"
 
     print(f"\n✓ Staging models built successfully")
     print(f"  - stg_customers: Created")
@@ -194,7 +254,7 @@ def test_staging_models_build(dbt_project_dir: Path, dbt_env: dict):
 # Test 5: Staging Model Tests Pass
 # ============================================================================
 
-def test_staging_model_tests_pass(dbt_project_dir: Path, dbt_env: dict):
+def test_staging_model_tests_pass(dbt_staging_build):
     """
     Verify all dbt tests pass for staging models.
 
@@ -205,20 +265,22 @@ def test_staging_model_tests_pass(dbt_project_dir: Path, dbt_env: dict):
     - accepted_range
     - accepted_values
     """
-    result = subprocess.run(
-        ["dbt", "test", "--select", "staging"],
-        cwd=dbt_project_dir,
-        env=dbt_env,
-        capture_output=True,
-        text=True
-    )
+    _, _, run_results = dbt_staging_build
+
+    # dbt build already executed the staging tests; read their outcomes
+    # from run_results.json instead of a second dbt test invocation
+    test_results = [
+        r for r in run_results["results"] if r["unique_id"].startswith("test.")
+    ]
+
+    failed_tests = [r["unique_id"] for r in test_results if r["status"] not in ("pass", "skipped")]
 
     # Note: Tests may fail if data quality issues exist in Bronze
     # We'll be lenient and check for overall execution
-    if result.returncode != 0:
+    if failed_tests:
         print(f"\n⚠️  Some dbt tests failed (this may be expected for Bronze data)")
-        print(f"Output:\n{result.stdout}")
-        print(f"Errors:\n{result.stderr}")
+        for unique_id in failed_tests:
+            print(f"  - {unique_id}")
 
         # Don't fail the pytest - just warn
         pytest.skip("dbt tests failed - may need data quality fixes in Bronze")
@@ -230,35 +292,26 @@ def test_staging_model_tests_pass(dbt_project_dir: Path, dbt_env: dict):
 # Test 6: Deduplication Works
 # ============================================================================
 
-def test_deduplication_works(dbt_project_dir: Path, dbt_env: dict):
+def test_deduplication_works(dbt_staging_build):
     """
     Verify deduplication logic in stg_transactions.
 
     This test verifies the ROW_NUMBER() deduplication works correctly.
     """
-    # Run stg_transactions model
-    result = subprocess.run(
-        ["dbt", "run", "--select", "stg_transactions", "--full-refresh"],
-        cwd=dbt_project_dir,
-        env=dbt_env,
-        capture_output=True,
-        text=True
-    )
+    # dbt build already ran the unique test on stg_transactions; read its
+    # outcome from run_results.json instead of re-running model + test
+    _, _, run_results = dbt_staging_build
 
-    assert result.returncode == 0, \
-        f"stg_transactions failed to build:\n{result.stdout}\n{result.stderr}"
+    unique_results = [
+        r for r in run_results["results"]
+        if r["unique_id"].startswith("test.customer_analytics.unique_stg_transactions_transaction_id")
+    ]
 
-    # Test uniqueness constraint (this would fail if deduplication didn't work)
-    result = subprocess.run(
-        ["dbt", "test", "--select", "stg_transactions", "--select", "test_type:unique"],
-        cwd=dbt_project_dir,
-        env=dbt_env,
-        capture_output=True,
-        text=True
-    )
+    assert unique_results, \
+        "unique_stg_transactions_transaction_id test not found in run_results.json"
 
     # If uniqueness test passes, deduplication worked
-    if result.returncode == 0:
+    if all(r["status"] == "pass" for r in unique_results):
         print(f"\n✓ Deduplication logic working (transaction_ids are unique)")
     else:
         print(f"\n⚠️  Uniqueness test failed - may indicate deduplication issue")
@@ -268,50 +321,93 @@ def test_deduplication_works(dbt_project_dir: Path, dbt_env: dict):
 # Test 7: Incremental Load Works
 # ============================================================================
 
-def test_incremental_load_works(dbt_project_dir: Path, dbt_env: dict):
+def test_incremental_load_works(
+    dbt_project_dir: Path, dbt_env: dict, dbt_runner, snowflake_connection
+):
     """
     Verify incremental loading works for stg_transactions.
 
     Tests:
     1. Initial full load
     2. Incremental load (no new data)
-    3. Verify incremental mode executed
+    3. Verify the incremental run scanned/produced (almost) nothing
+
+    The model tags its queries with 'stg_transactions_inc_<invocation_id>',
+    so each run's MERGE/CTAS can be found in QUERY_HISTORY by tag.
     """
+    project_args = [
+        "--project-dir", str(dbt_project_dir),
+        "--profiles-dir", str(dbt_project_dir),
+    ]
+    run_results_path = dbt_project_dir / "target" / "run_results.json"
+
+    def run_stats():
+        """Parse invocation_id + model execution_time from run_results.json."""
+        run_results = json.loads(run_results_path.read_text())
+        return (
+            run_results["metadata"]["invocation_id"],
+            run_results["results"][0]["execution_time"],
+        )
+
+    def tagged_scan(cursor, invocation_id):
+        """Fetch bytes_scanned / rows_produced for the run's tagged DML."""
+        cursor.execute(
+            """
+            SELECT bytes_scanned, rows_produced
+            FROM TABLE(INFORMATION_SCHEMA.QUERY_HISTORY(RESULT_LIMIT => 1000))
+            WHERE query_tag = %s
+              AND query_type IN ('MERGE', 'INSERT', 'CREATE_TABLE_AS_SELECT')
+            ORDER BY start_time DESC
+            LIMIT 1
+            """,
+            (f"stg_transactions_inc_{invocation_id}",),
+        )
+        return cursor.fetchone()
+
     # Initial full load
     print(f"\n  Step 1: Running initial full load...")
-    result = subprocess.run(
-        ["dbt", "run", "--select", "stg_transactions", "--full-refresh"],
-        cwd=dbt_project_dir,
-        env=dbt_env,
-        capture_output=True,
-        text=True
+    res = dbt_runner.invoke(
+        ["run", "--select", "stg_transactions", "--full-refresh"] + project_args
     )
 
-    assert result.returncode == 0, \
-        f"Initial load failed:\n{result.stdout}\n{result.stderr}"
+    assert res.success, f"Initial load failed:\n{res.exception}"
 
-    print(f"  ✓ Initial load completed")
+    initial_id, initial_time = run_stats()
+    print(f"  ✓ Initial load completed in {initial_time:.1f}s")
 
     # Incremental load (should process only new data)
     print(f"\n  Step 2: Running incremental load...")
-    result = subprocess.run(
-        ["dbt", "run", "--select", "stg_transactions"],
-        cwd=dbt_project_dir,
-        env=dbt_env,
-        capture_output=True,
-        text=True
+    res = dbt_runner.invoke(
+        ["run", "--select", "stg_transactions"] + project_args
     )
 
-    assert result.returncode == 0, \
-        f"Incremental load failed:\n{result.stdout}\n{result.stderr}"
+    assert res.success, f"Incremental load failed:\n{res.exception}"
 
-    # Check if incremental mode was used
-    # (dbt logs typically show "incremental" or "merge" in output)
-    output_lower = result.stdout.lower()
-    if "incremental" in output_lower or "merge" in output_lower:
-        print(f"  ✓ Incremental mode executed")
+    incremental_id, incremental_time = run_stats()
+    print(f"  ✓ Incremental load completed in {incremental_time:.1f}s")
+
+    # A no-op incremental run should scan a fraction of the full refresh
+    # and merge zero rows — the real signal that pruning works, rather
+    # than string-matching "incremental" in the log output
+    cursor = snowflake_connection.cursor()
+    initial_scan = tagged_scan(cursor, initial_id)
+    incremental_scan = tagged_scan(cursor, incremental_id)
+    cursor.close()
+
+    if initial_scan and incremental_scan:
+        initial_bytes = initial_scan[0]
+        incremental_bytes, rows_produced = incremental_scan
+
+        assert incremental_bytes < max(initial_bytes * 0.1, 1), \
+            f"Incremental run scanned {incremental_bytes:,} bytes " \
+            f"(full refresh scanned {initial_bytes:,} - is pruning working?)"
+        assert rows_produced == 0, \
+            f"No-op incremental run produced {rows_produced:,} rows (expected 0)"
+
+        print(f"  ✓ Incremental scan: {incremental_bytes:,} bytes, 0 rows "
+              f"(full refresh: {initial_bytes:,} bytes)")
     else:
-        print(f"  ⚠️  Could not confirm incremental mode (may have run full refresh)")
+        print(f"  ⚠️  Tagged queries not found in QUERY_HISTORY yet - skipping scan check")
 
     print(f"\n✓ Incremental loading mechanism working")
 
@@ -320,7 +416,7 @@ def test_incremental_load_works(dbt_project_dir: Path, dbt_env: dict):
 # Test 8: Observability Logging
 # ============================================================================
 
-def test_observability_logging(dbt_project_dir: Path, dbt_env: dict):
+def test_observability_logging(snowflake_connection, dbt_staging_build):
     """
     Verify dbt run hooks log to OBSERVABILITY.PIPELINE_RUN_METADATA.
 
@@ -329,21 +425,25 @@ def test_observability_logging(dbt_project_dir: Path, dbt_env: dict):
     - on-run-start hook executes
     - on-run-end hook executes
     """
-    # Run dbt to trigger hooks
-    result = subprocess.run(
-        ["dbt", "run", "--select", "stg_customers"],
-        cwd=dbt_project_dir,
-        env=dbt_env,
-        capture_output=True,
-        text=True
+    # The shared build already fired the hooks; look up its row by
+    # invocation_id instead of re-materializing a model just to observe them
+    _, _, run_results = dbt_staging_build
+    invocation_id = run_results["metadata"]["invocation_id"]
+
+    cursor = snowflake_connection.cursor()
+    cursor.execute(
+        """
+        SELECT COUNT(*)
+        FROM OBSERVABILITY.PIPELINE_RUN_METADATA
+        WHERE run_id = %s
+        """,
+        (invocation_id,),
     )
+    hook_rows = cursor.fetchone()[0]
+    cursor.close()
 
-    assert result.returncode == 0, \
-        f"dbt run failed:\n{result.stdout}\n{result.stderr}"
-
-    # Check if hooks executed (look for log messages)
-    if "dbt Run Started" in result.stdout or "dbt Run Completed" in result.stdout:
-        print(f"\n✓ Observability hooks executed")
+    if hook_rows >= 1:
+        print(f"\n✓ Observability hooks executed (run_id {invocation_id})")
     else:
         print(f"\n⚠️  Could not confirm observability hooks (may need to check Snowflake)")
 
@@ -15,19 +15,33 @@ Run:
 import os
 import pytest
 import yaml
+from functools import lru_cache
 from snowflake.connector import connect
 from dotenv import load_dotenv
 
+# libyaml's C loader parses ~10x faster than the pure-Python SafeLoader;
+# fall back when PyYAML was built without it
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
+
 # Load environment variables
 load_dotenv()
 
 
-@pytest.fixture(scope="module")
-def semantic_model():
-    """Load and parse semantic_model.yaml"""
+@lru_cache(maxsize=1)
+def _load_semantic_model():
+    """Parse semantic_model.yaml once per process and memoize the result."""
     model_path = "semantic_layer/semantic_model.yaml"
     with open(model_path, 'r') as f:
-        return yaml.safe_load(f)
+        return yaml.load(f, Loader=SafeLoader)
+
+
+@pytest.fixture(scope="module")
+def semantic_model():
+    """Load and parse semantic_model.yaml (memoized across modules)"""
+    return _load_semantic_model()
 
 
 @pytest.fixture(scope="module")
@@ -41,6 +55,10 @@ def snowflake_conn():
         database=os.getenv("SNOWFLAKE_DATABASE", "CUSTOMER_ANALYTICS"),
         schema=os.getenv("SNOWFLAKE_SCHEMA", "GOLD"),
         role=os.getenv("SNOWFLAKE_ROLE", "SYSADMIN"),
+        session_parameters={
+            "CLIENT_METADATA_REQUEST_USE_CONNECTION_CTX": True,
+            "USE_CACHED_RESULT": True,
+        },
     )
     yield conn
     conn.close()
@@ -59,6 +77,7 @@ def cursor(snowflake_conn):
 # ============================================================================
 
 
+@pytest.mark.metadata
 def test_semantic_model_valid_yaml(semantic_model):
     """
     Test that semantic_model.yaml is valid YAML and contains required keys.
@@ -96,16 +115,21 @@ def test_semantic_model_valid_yaml(semantic_model):
 # ============================================================================
 
 
+@pytest.mark.metadata
 def test_all_tables_exist(semantic_model, cursor):
     """
     Test that all tables referenced in semantic model exist in Snowflake.
 
     For each table in semantic_model.yaml:
     - Parse base_table (DATABASE.SCHEMA.TABLE)
-    - Query INFORMATION_SCHEMA to verify existence
+    - Check membership in one cached SHOW TERSE TABLES listing per database
     """
     missing_tables = []
 
+    # One SHOW TERSE TABLES per distinct database (cloud-services metadata,
+    # no warehouse) replaces a per-table INFORMATION_SCHEMA round-trip
+    tables_by_db = {}
+
     for table in semantic_model['tables']:
         table_name = table['name']
         base_table = table['base_table']
@@ -115,16 +139,12 @@ def test_all_tables_exist(semantic_model, cursor):
         if len(parts) == 3:
             db, schema, tbl = parts
 
-            cursor.execute(f"""
-                SELECT COUNT(*) AS table_exists
-                FROM INFORMATION_SCHEMA.TABLES
-                WHERE TABLE_CATALOG = '{db}'
-                  AND TABLE_SCHEMA = '{schema}'
-                  AND TABLE_NAME = '{tbl}'
-            """)
-            result = cursor.fetchone()
+            if db not in tables_by_db:
+                cursor.execute(f"SHOW TERSE TABLES IN DATABASE {db}")
+                # SHOW output: name index 1, database index 3, schema index 4
+                tables_by_db[db] = {(row[4], row[1]) for row in cursor.fetchall()}
 
-            if result[0] == 0:
+            if (schema, tbl) not in tables_by_db[db]:
                 missing_tables.append(base_table)
             else:
                 print(f"  ✓ {base_table} exists")
@@ -138,6 +158,7 @@ def test_all_tables_exist(semantic_model, cursor):
 # ============================================================================
 
 
+@pytest.mark.warehouse
 def test_all_metrics_calculable(semantic_model, cursor):
     """
     Test that metrics defined in semantic model can be calculated.
@@ -193,6 +214,7 @@ def test_all_metrics_calculable(semantic_model, cursor):
 # ============================================================================
 
 
+@pytest.mark.warehouse
 def test_relationships_valid(semantic_model, cursor):
     """
     Test that relationships between tables are valid.
@@ -222,17 +244,19 @@ def test_relationships_valid(semantic_model, cursor):
         assert from_base is not None, f"Table {from_table} not found in semantic model"
         assert to_base is not None, f"Table {to_table} not found in semantic model"
 
-        # Test join
+        # Existence probe: LIMIT 1 lets Snowflake stop at the first
+        # matched row, whereas COUNT(*) would aggregate every match
+        # before any LIMIT applies
         cursor.execute(f"""
-            SELECT COUNT(*) AS join_count
+            SELECT 1
             FROM {from_base} f
             JOIN {to_base} t ON f.{join_key} = t.{join_key}
-            LIMIT 1000
+            LIMIT 1
         """)
         result = cursor.fetchone()
 
-        assert result[0] > 0, f"Join {from_table} → {to_table} returned no results"
-        print(f"    ✓ Join successful ({result[0]:,} rows)")
+        assert result is not None, f"Join {from_table} → {to_table} returned no results"
+        print(f"    ✓ Join successful")
 
 
 # ============================================================================
@@ -240,6 +264,7 @@ def test_relationships_valid(semantic_model, cursor):
 # ============================================================================
 
 
+@pytest.mark.warehouse
 def test_sample_questions_answerable(semantic_model, cursor):
     """
     Test representative sample questions from semantic model.
@@ -247,59 +272,44 @@ def test_sample_questions_answerable(semantic_model, cursor):
     Manually converts natural language questions to SQL and validates:
     - Query executes successfully
     - Returns meaningful results
-    """
-    test_queries = [
-        {
-            "question": "What is the average spend of customers in California?",
-            "sql": """
-                SELECT AVG(lifetime_value) AS avg_ltv
-                FROM GOLD.CUSTOMER_360_PROFILE
-                WHERE state = 'CA'
-            """,
-            "expected_result": "avg_ltv is not NULL"
-        },
-        {
-            "question": "How many customers are in High Risk churn category?",
-            "sql": """
-                SELECT COUNT(*) AS high_risk_count
-                FROM GOLD.CUSTOMER_360_PROFILE
-                WHERE churn_risk_category = 'High Risk'
-            """,
-            "expected_result": "count >= 0"
-        },
-        {
-            "question": "What is total spending in last 90 days?",
-            "sql": """
-                SELECT SUM(spend_last_90_days) AS total_spend_90d
-                FROM GOLD.CUSTOMER_360_PROFILE
-                WHERE spend_last_90_days > 0
-            """,
-            "expected_result": "total_spend > 0"
-        },
-        {
-            "question": "Compare lifetime value across segments",
-            "sql": """
-                SELECT
-                    customer_segment,
-                    AVG(lifetime_value) AS avg_ltv,
-                    COUNT(*) AS customer_count
-                FROM GOLD.CUSTOMER_360_PROFILE
-                GROUP BY customer_segment
-            """,
-            "expected_result": "multiple segments returned"
-        }
-    ]
 
+    All four questions read CUSTOMER_360_PROFILE, so they are fused into
+    one conditional-aggregate statement: one table scan and one
+    round-trip instead of four. The per-segment comparison rides along
+    as an OBJECT_AGG scalar subquery.
+    """
     print("\n✓ Testing sample questions:")
 
-    for test in test_queries:
-        print(f"\n  Q: {test['question']}")
-        cursor.execute(test['sql'])
-        result = cursor.fetchone()
+    cursor.execute("""
+        SELECT
+            AVG(CASE WHEN state = 'CA' THEN lifetime_value END) AS ca_avg_ltv,
+            COUNT_IF(churn_risk_category = 'High Risk') AS high_risk_count,
+            SUM(CASE WHEN spend_last_90_days > 0 THEN spend_last_90_days END) AS total_spend_90d,
+            (SELECT OBJECT_AGG(customer_segment, avg_ltv::VARIANT)
+             FROM (
+                 SELECT customer_segment, AVG(lifetime_value) AS avg_ltv
+                 FROM GOLD.CUSTOMER_360_PROFILE
+                 GROUP BY customer_segment
+             )) AS ltv_by_segment
+        FROM GOLD.CUSTOMER_360_PROFILE
+    """)
+    ca_avg_ltv, high_risk_count, total_spend_90d, ltv_by_segment = cursor.fetchone()
+
+    print("\n  Q: What is the average spend of customers in California?")
+    assert ca_avg_ltv is not None, "No California customers found"
+    print(f"    ✓ Avg LTV (CA): {ca_avg_ltv}")
+
+    print("\n  Q: How many customers are in High Risk churn category?")
+    assert high_risk_count is not None and high_risk_count >= 0
+    print(f"    ✓ High Risk customers: {high_risk_count}")
+
+    print("\n  Q: What is total spending in last 90 days?")
+    assert total_spend_90d is not None, "No 90-day spend recorded"
+    print(f"    ✓ Total spend (90d): {total_spend_90d}")
 
-        assert result is not None, f"Query returned no results: {test['question']}"
-        print(f"    ✓ Query executed successfully")
-        print(f"      Result: {result[0]}")
+    print("\n  Q: Compare lifetime value across segments")
+    assert ltv_by_segment is not None, "No segments returned"
+    print(f"    ✓ Avg LTV by segment: {ltv_by_segment}")
 
 
 # ============================================================================
@@ -307,6 +317,7 @@ def test_sample_questions_answerable(semantic_model, cursor):
 # ============================================================================
 
 
+@pytest.mark.metadata
 def test_dimensions_and_metrics_coverage(semantic_model):
     """
     Test that semantic model has sufficient dimensions and metrics.
@@ -345,6 +356,7 @@ def test_dimensions_and_metrics_coverage(semantic_model):
 # ============================================================================
 
 
+@pytest.mark.metadata
 def test_optimization_hints_present(semantic_model):
     """
     Test that optimization hints are provided in semantic model.
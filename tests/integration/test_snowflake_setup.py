@@ -1,42 +1,75 @@
 """
 Integration tests for Snowflake foundation setup.
 Tests database objects, schemas, roles, and RBAC configuration.
+
+All tests are read-only metadata probes, so the module is safe under
+pytest-xdist (pytest -n auto --dist=loadfile): each worker opens one
+session-scoped connection and files fan out across workers.
 """
-import os
 import pytest
-import snowflake.connector
-from dotenv import load_dotenv
 
-# Load environment variables
-load_dotenv()
 
-# Snowflake connection parameters
-SNOWFLAKE_CONFIG = {
-    'account': os.getenv('SNOWFLAKE_ACCOUNT'),
-    'user': os.getenv('SNOWFLAKE_USER'),
-    'password': os.getenv('SNOWFLAKE_PASSWORD'),
-    'warehouse': os.getenv('SNOWFLAKE_WAREHOUSE', 'COMPUTE_WH'),
-    'database': 'CUSTOMER_ANALYTICS',
-}
+# The session-scoped snowflake_connection fixture shared by all
+# integration modules lives in tests/conftest.py
+
+
+@pytest.fixture(scope='session')
+def cursor(snowflake_connection):
+    """Create cursor from connection."""
+    return snowflake_connection.cursor()
 
 
 @pytest.fixture(scope='module')
-def snowflake_connection():
-    """Create Snowflake connection for testing."""
-    if not all([SNOWFLAKE_CONFIG['account'], SNOWFLAKE_CONFIG['user'], SNOWFLAKE_CONFIG['password']]):
-        pytest.skip("Snowflake credentials not configured in .env file")
+def all_schemas(cursor):
+    """
+    Cache the schema listing for the module.
 
-    conn = snowflake.connector.connect(**SNOWFLAKE_CONFIG)
-    yield conn
-    conn.close()
+    One SHOW SCHEMAS round-trip replaces a per-schema SHOW SCHEMAS LIKE
+    probe in each test.
+    """
+    cursor.execute("SHOW SCHEMAS IN DATABASE CUSTOMER_ANALYTICS")
+    return {row[1] for row in cursor.fetchall()}
 
 
 @pytest.fixture(scope='module')
-def cursor(snowflake_connection):
-    """Create cursor from connection."""
-    return snowflake_connection.cursor()
+def observability_tables(cursor):
+    """
+    Cache the OBSERVABILITY table listing for the module.
+
+    One SHOW TABLES round-trip replaces a per-table SHOW TABLES LIKE
+    probe (each preceded by two USE statements) in each test.
+    """
+    cursor.execute("SHOW TABLES IN SCHEMA CUSTOMER_ANALYTICS.OBSERVABILITY")
+    return {row[1] for row in cursor.fetchall()}
 
 
+@pytest.fixture(scope='module')
+def role_grants(snowflake_connection):
+    """
+    Cache SHOW GRANTS TO ROLE output per role for the module.
+
+    TestRBAC and TestWarehouseAccess both inspect grants for the same
+    roles; fetching each role's grants once (3 round-trips instead of
+    6+) matters because SHOW GRANTS is metadata-throttled. The three
+    calls are latency-bound, so they run concurrently on separate
+    cursors of the shared connection — total time is one round-trip,
+    not three.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    def fetch_grants(role):
+        cur = snowflake_connection.cursor()
+        try:
+            return role, cur.execute(f"SHOW GRANTS TO ROLE {role}").fetchall()
+        finally:
+            cur.close()
+
+    roles = ['DATA_ENGINEER', 'MARKETING_MANAGER', 'DATA_ANALYST']
+    with ThreadPoolExecutor(max_workers=len(roles)) as pool:
+        return dict(pool.map(fetch_grants, roles))
+
+
+@pytest.mark.metadata
 class TestDatabaseAndSchemas:
     """Test database and schema creation."""
 
@@ -49,47 +82,37 @@ class TestDatabaseAndSchemas:
         db_names = [row[1] for row in databases]
         assert 'CUSTOMER_ANALYTICS' in db_names
 
-    def test_bronze_schema_exists(self, cursor):
+    def test_bronze_schema_exists(self, all_schemas):
         """Verify BRONZE schema exists."""
-        cursor.execute("USE DATABASE CUSTOMER_ANALYTICS")
-        cursor.execute("SHOW SCHEMAS LIKE 'BRONZE'")
-        schemas = cursor.fetchall()
-        assert len(schemas) > 0, "BRONZE schema not found"
+        assert 'BRONZE' in all_schemas, "BRONZE schema not found"
 
-    def test_silver_schema_exists(self, cursor):
+    def test_silver_schema_exists(self, all_schemas):
         """Verify SILVER schema exists."""
-        cursor.execute("USE DATABASE CUSTOMER_ANALYTICS")
-        cursor.execute("SHOW SCHEMAS LIKE 'SILVER'")
-        schemas = cursor.fetchall()
-        assert len(schemas) > 0, "SILVER schema not found"
+        assert 'SILVER' in all_schemas, "SILVER schema not found"
 
-    def test_gold_schema_exists(self, cursor):
+    def test_gold_schema_exists(self, all_schemas):
         """Verify GOLD schema exists."""
-        cursor.execute("USE DATABASE CUSTOMER_ANALYTICS")
-        cursor.execute("SHOW SCHEMAS LIKE 'GOLD'")
-        schemas = cursor.fetchall()
-        assert len(schemas) > 0, "GOLD schema not found"
+        assert 'GOLD' in all_schemas, "GOLD schema not found"
 
-    def test_observability_schema_exists(self, cursor):
+    def test_observability_schema_exists(self, all_schemas):
         """Verify OBSERVABILITY schema exists."""
-        cursor.execute("USE DATABASE CUSTOMER_ANALYTICS")
-        cursor.execute("SHOW SCHEMAS LIKE 'OBSERVABILITY'")
-        schemas = cursor.fetchall()
-        assert len(schemas) > 0, "OBSERVABILITY schema not found"
+        assert 'OBSERVABILITY' in all_schemas, "OBSERVABILITY schema not found"
 
     def test_all_schemas_have_comments(self, cursor):
         """Verify all schemas have descriptive comments."""
-        cursor.execute("USE DATABASE CUSTOMER_ANALYTICS")
-        cursor.execute("SHOW SCHEMAS")
-        schemas = cursor.fetchall()
-
-        for schema in schemas:
-            schema_name = schema[1]
-            if schema_name in ['BRONZE', 'SILVER', 'GOLD', 'OBSERVABILITY']:
-                comment = schema[4] if len(schema) > 4 else None
-                assert comment, f"Schema {schema_name} missing comment"
-
-
+        # INFORMATION_SCHEMA.SCHEMATA with just the two needed columns:
+        # no dependence on SHOW SCHEMAS column positions, which shift
+        # across Snowflake versions
+        cursor.execute("""
+            SELECT SCHEMA_NAME, COMMENT
+            FROM CUSTOMER_ANALYTICS.INFORMATION_SCHEMA.SCHEMATA
+            WHERE SCHEMA_NAME IN ('BRONZE', 'SILVER', 'GOLD', 'OBSERVABILITY')
+        """)
+        for schema_name, comment in cursor.fetchall():
+            assert comment, f"Schema {schema_name} missing comment"
+
+
+@pytest.mark.metadata
 class TestRoles:
     """Test role creation."""
 
@@ -115,98 +138,106 @@ class TestRoles:
 class TestObservabilityTables:
     """Test observability table creation."""
 
-    def test_pipeline_run_metadata_table_exists(self, cursor):
+    @pytest.mark.metadata
+    def test_pipeline_run_metadata_table_exists(self, observability_tables):
         """Verify PIPELINE_RUN_METADATA table exists."""
-        cursor.execute("USE DATABASE CUSTOMER_ANALYTICS")
-        cursor.execute("USE SCHEMA OBSERVABILITY")
-        cursor.execute("SHOW TABLES LIKE 'PIPELINE_RUN_METADATA'")
-        tables = cursor.fetchall()
-        assert len(tables) > 0, "PIPELINE_RUN_METADATA table not found"
+        assert 'PIPELINE_RUN_METADATA' in observability_tables, \
+            "PIPELINE_RUN_METADATA table not found"
 
-    def test_data_quality_metrics_table_exists(self, cursor):
+    @pytest.mark.metadata
+    def test_data_quality_metrics_table_exists(self, observability_tables):
         """Verify DATA_QUALITY_METRICS table exists."""
-        cursor.execute("USE DATABASE CUSTOMER_ANALYTICS")
-        cursor.execute("USE SCHEMA OBSERVABILITY")
-        cursor.execute("SHOW TABLES LIKE 'DATA_QUALITY_METRICS'")
-        tables = cursor.fetchall()
-        assert len(tables) > 0, "DATA_QUALITY_METRICS table not found"
+        assert 'DATA_QUALITY_METRICS' in observability_tables, \
+            "DATA_QUALITY_METRICS table not found"
 
-    def test_layer_record_counts_table_exists(self, cursor):
+    @pytest.mark.metadata
+    def test_layer_record_counts_table_exists(self, observability_tables):
         """Verify LAYER_RECORD_COUNTS table exists."""
-        cursor.execute("USE DATABASE CUSTOMER_ANALYTICS")
-        cursor.execute("USE SCHEMA OBSERVABILITY")
-        cursor.execute("SHOW TABLES LIKE 'LAYER_RECORD_COUNTS'")
-        tables = cursor.fetchall()
-        assert len(tables) > 0, "LAYER_RECORD_COUNTS table not found"
+        assert 'LAYER_RECORD_COUNTS' in observability_tables, \
+            "LAYER_RECORD_COUNTS table not found"
 
-    def test_model_execution_log_table_exists(self, cursor):
+    @pytest.mark.metadata
+    def test_model_execution_log_table_exists(self, observability_tables):
         """Verify MODEL_EXECUTION_LOG table exists."""
-        cursor.execute("USE DATABASE CUSTOMER_ANALYTICS")
-        cursor.execute("USE SCHEMA OBSERVABILITY")
-        cursor.execute("SHOW TABLES LIKE 'MODEL_EXECUTION_LOG'")
-        tables = cursor.fetchall()
-        assert len(tables) > 0, "MODEL_EXECUTION_LOG table not found"
+        assert 'MODEL_EXECUTION_LOG' in observability_tables, \
+            "MODEL_EXECUTION_LOG table not found"
 
+    @pytest.mark.warehouse
     def test_pipeline_metadata_has_test_row(self, cursor):
         """Verify sample test row was inserted."""
-        cursor.execute("USE DATABASE CUSTOMER_ANALYTICS")
-        cursor.execute("USE SCHEMA OBSERVABILITY")
-        cursor.execute("SELECT COUNT(*) FROM PIPELINE_RUN_METADATA WHERE run_id = 'SETUP_TEST_RUN'")
+        # Fully qualified name instead of two USE round-trips; the shared
+        # session's context stays untouched for other tests
+        cursor.execute(
+            "SELECT COUNT(*) FROM CUSTOMER_ANALYTICS.OBSERVABILITY.PIPELINE_RUN_METADATA"
+            " WHERE run_id = 'SETUP_TEST_RUN'"
+        )
         result = cursor.fetchone()
         assert result[0] >= 1, "Test row not found in PIPELINE_RUN_METADATA"
 
+    @pytest.mark.metadata
     def test_observability_views_exist(self, cursor):
         """Verify observability views were created."""
-        cursor.execute("USE DATABASE CUSTOMER_ANALYTICS")
-        cursor.execute("USE SCHEMA OBSERVABILITY")
-
-        views = [
+        expected_views = {
             'V_LATEST_PIPELINE_RUNS',
             'V_RECENT_DQ_FAILURES',
             'V_RECORD_COUNT_TRENDS'
-        ]
+        }
 
-        for view_name in views:
-            cursor.execute(f"SHOW VIEWS LIKE '{view_name}'")
-            result = cursor.fetchall()
-            assert len(result) > 0, f"View {view_name} not found"
+        # One STARTS WITH probe for all three views instead of a
+        # SHOW VIEWS LIKE round-trip each
+        cursor.execute(
+            "SHOW VIEWS IN SCHEMA CUSTOMER_ANALYTICS.OBSERVABILITY STARTS WITH 'V_'"
+        )
+        existing_views = {row[1] for row in cursor.fetchall()}
 
+        missing_views = expected_views - existing_views
+        assert len(missing_views) == 0, f"Views not found: {missing_views}"
 
+
+@pytest.mark.metadata
 class TestRBAC:
     """Test role-based access control permissions."""
 
-    def test_data_engineer_has_database_access(self, cursor):
+    # SHOW GRANTS TO ROLE columns: privilege is index 1, granted_on
+    # index 2, object name index 3. Checking the typed fields avoids
+    # stringifying every tuple and false positives from substrings in
+    # unrelated columns.
+
+    def test_data_engineer_has_database_access(self, role_grants):
         """Verify DATA_ENGINEER has access to CUSTOMER_ANALYTICS."""
-        cursor.execute("SHOW GRANTS TO ROLE DATA_ENGINEER")
-        grants = cursor.fetchall()
+        grants = role_grants['DATA_ENGINEER']
 
         # Check for database usage grant
-        database_grants = [g for g in grants if 'CUSTOMER_ANALYTICS' in str(g)]
+        database_grants = [g for g in grants if 'CUSTOMER_ANALYTICS' in g[3]]
         assert len(database_grants) > 0, "DATA_ENGINEER missing database grants"
 
-    def test_marketing_manager_has_limited_access(self, cursor):
+    def test_marketing_manager_has_limited_access(self, role_grants, cursor):
         """Verify MARKETING_MANAGER has only GOLD schema access."""
-        cursor.execute("SHOW GRANTS TO ROLE MARKETING_MANAGER")
-        grants = cursor.fetchall()
+        grants = role_grants['MARKETING_MANAGER']
 
         # Should have GOLD schema grants
-        gold_grants = [g for g in grants if 'GOLD' in str(g)]
+        gold_grants = [g for g in grants if 'GOLD' in g[3]]
         assert len(gold_grants) > 0, "MARKETING_MANAGER missing GOLD schema grants"
 
-        # Should NOT have BRONZE schema grants
-        bronze_grants = [g for g in grants if 'BRONZE' in str(g) and 'GRANT' in str(g)]
-        assert len(bronze_grants) == 0, "MARKETING_MANAGER should not have BRONZE access"
+        # Should NOT have BRONZE schema grants. Asking the BRONZE schema
+        # who holds grants on it (grantee_name is index 5) ships only the
+        # schema's handful of grant rows, instead of scanning the role's
+        # entire grant list for a BRONZE substring.
+        cursor.execute("SHOW GRANTS ON SCHEMA CUSTOMER_ANALYTICS.BRONZE")
+        bronze_grantees = {row[5] for row in cursor.fetchall()}
+        assert 'MARKETING_MANAGER' not in bronze_grantees, \
+            "MARKETING_MANAGER should not have BRONZE access"
 
-    def test_data_analyst_has_read_access(self, cursor):
+    def test_data_analyst_has_read_access(self, role_grants):
         """Verify DATA_ANALYST has SELECT privileges."""
-        cursor.execute("SHOW GRANTS TO ROLE DATA_ANALYST")
-        grants = cursor.fetchall()
+        grants = role_grants['DATA_ANALYST']
 
         # Check for SELECT grants
-        select_grants = [g for g in grants if 'SELECT' in str(g)]
+        select_grants = [g for g in grants if g[1] == 'SELECT']
         assert len(select_grants) > 0, "DATA_ANALYST missing SELECT grants"
 
 
+@pytest.mark.metadata
 class TestWarehouseAccess:
     """Test warehouse access for roles."""
 
@@ -216,15 +247,13 @@ class TestWarehouseAccess:
         warehouses = cursor.fetchall()
         assert len(warehouses) > 0, "COMPUTE_WH warehouse not found"
 
-    def test_roles_have_warehouse_usage(self, cursor):
+    def test_roles_have_warehouse_usage(self, role_grants):
         """Verify all roles have warehouse USAGE."""
-        roles = ['DATA_ENGINEER', 'MARKETING_MANAGER', 'DATA_ANALYST']
-
-        for role in roles:
-            cursor.execute(f"SHOW GRANTS TO ROLE {role}")
-            grants = cursor.fetchall()
-
-            warehouse_grants = [g for g in grants if 'COMPUTE_WH' in str(g) and 'USAGE' in str(g)]
+        for role, grants in role_grants.items():
+            warehouse_grants = [
+                g for g in grants
+                if g[2] == 'WAREHOUSE' and g[3] == 'COMPUTE_WH' and g[1] == 'USAGE'
+            ]
             assert len(warehouse_grants) > 0, f"{role} missing warehouse USAGE grant"
 
 